@@ -0,0 +1,30 @@
+"""
+Tuned Mock API Server Launcher
+
+The `--reload` command in mock_apis/main.py is for development only.
+For pipeline runs and benchmarking, use this launcher: it spawns one
+worker per core (2*N+1 rule), raises the accept backlog so bursty
+clients (the demo queries 5+ parts back-to-back) don't serialize on a
+single loop, and keeps connections alive between queries.
+
+Usage: python scripts/serve_mock.py
+"""
+
+import os
+import sys
+
+import uvicorn
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "mock_apis.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=2 * (os.cpu_count() or 1) + 1,
+        # uvloop is not available on Windows - let uvicorn fall back there
+        loop="uvloop" if sys.platform != "win32" else "auto",
+        http="httptools",
+        backlog=2048,
+        limit_concurrency=1000,
+        timeout_keep_alive=15,
+    )
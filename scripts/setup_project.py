@@ -7,6 +7,8 @@ Run this first: python scripts/setup_project.py
 """
 
 from pathlib import Path
+import os
+import shutil
 import sys
 
 # Add src to path
@@ -34,16 +36,17 @@ def cleanup_old_databases():
 
 def create_directory_structure():
     """Create all required directories"""
-    dirs = [
+    dirs = (
         "data/raw",
         "data/processed",
         "diagrams/screenshots",
         "tests"
-    ]
-    
+    )
+
     for dir_path in dirs:
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
-        print(f"✅ Created directory: {dir_path}")
+        os.makedirs(dir_path, exist_ok=True)
+    # One summary line instead of a print (stdout flush) per directory
+    print(f"✅ Created directories: {', '.join(dirs)}")
 
 
 def setup_environment():
@@ -52,7 +55,8 @@ def setup_environment():
     env_file = Path(".env")
     
     if not env_file.exists() and env_template.exists():
-        env_file.write_text(env_template.read_text())
+        # In-kernel copy - no decode/encode round-trip through a Python str
+        shutil.copyfile(env_template, env_file)
         print("✅ Created .env file")
 
 
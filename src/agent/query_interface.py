@@ -13,8 +13,10 @@ class AuraQueryInterface:
     High-level interface for querying Aura's knowledge base.
     """
     
-    def __init__(self, db_path: str):
-        self.safety_layer = AuraAgentSafetyLayer(db_path)
+    def __init__(self, db_path: str, conn=None):
+        # An existing DuckDB connection can be passed through so multiple
+        # interfaces share one connection (and its object cache)
+        self.safety_layer = AuraAgentSafetyLayer(db_path, conn=conn)
     
     def ask(self, part_id: str, question: str) -> Dict[str, Any]:
         """
@@ -26,6 +28,15 @@ class AuraQueryInterface:
         - "Is it safe to order from Supplier A?"
         """
         return self.safety_layer.query_with_safety(part_id, question)
+
+    def ask_many(self, part_ids) -> Dict[str, Dict[str, Any]]:
+        """
+        Ask Aura about several parts in one round trip.
+
+        A single batched query replaces the per-part ask() loop, so an
+        N-part sweep costs one DuckDB scan instead of N.
+        """
+        return self.safety_layer.query_many(part_ids)
     
     def get_all_low_stock_parts(self) -> List[Dict[str, Any]]:
         """
@@ -42,15 +53,13 @@ class AuraQueryInterface:
                     confidence_level
                 FROM gold.inventory_facts
                 WHERE fact_valid_to IS NULL
-                AND (
-                    json_extract_string(reorder_recommendation, '$.urgency') = 'urgent'
-                    OR json_extract_string(reorder_recommendation, '$.urgency') = 'recommended'
-                )
+                AND urgency IN ('urgent', 'recommended')
                 ORDER BY effective_inventory ASC
             """
-            results = self.safety_layer.conn.execute(query).fetchall()
-            columns = ['part_id', 'part_name', 'effective_inventory', 'reorder_recommendation', 'confidence_level']
-            return [dict(zip(columns, row)) for row in results]
+            # Arrow fetch: columnar buffers out of DuckDB, records built once
+            # at the boundary instead of tuple-then-dict per row
+            tbl = self.safety_layer.conn.execute(query).fetch_arrow_table()
+            return tbl.to_pylist()
         except Exception as e:
             print(f"Error querying low stock parts: {e}")
             return []
@@ -74,10 +83,8 @@ class AuraQueryInterface:
                 AND (has_inconsistency = TRUE OR data_reliability_index < 0.6)
                 ORDER BY data_reliability_index ASC
             """
-            results = self.safety_layer.conn.execute(query).fetchall()
-            columns = ['part_id', 'part_name', 'effective_inventory', 'data_reliability_index', 
-                      'has_inconsistency', 'semantic_context', 'confidence_level']
-            return [dict(zip(columns, row)) for row in results]
+            tbl = self.safety_layer.conn.execute(query).fetch_arrow_table()
+            return tbl.to_pylist()
         except Exception as e:
             print(f"Error querying parts with warnings: {e}")
             return []
@@ -87,23 +94,28 @@ class AuraQueryInterface:
         Get a summary of the entire inventory state.
         """
         try:
+            # COALESCE keeps the aggregates numeric when the table is
+            # empty - NULLs would come back as numpy masked values that
+            # int() can't convert
             query = """
-                SELECT 
+                SELECT
                     COUNT(*) as total_parts,
-                    SUM(effective_inventory) as total_units,
-                    AVG(data_reliability_index) as avg_reliability,
-                    SUM(CASE WHEN has_inconsistency THEN 1 ELSE 0 END) as parts_with_warnings,
-                    SUM(CASE WHEN json_extract_string(reorder_recommendation, '$.urgency') = 'urgent' THEN 1 ELSE 0 END) as urgent_reorders
+                    COALESCE(SUM(effective_inventory), 0) as total_units,
+                    COALESCE(AVG(data_reliability_index), 0) as avg_reliability,
+                    COALESCE(SUM(CASE WHEN has_inconsistency THEN 1 ELSE 0 END), 0) as parts_with_warnings,
+                    COALESCE(SUM(CASE WHEN urgency = 'urgent' THEN 1 ELSE 0 END), 0) as urgent_reorders
                 FROM gold.inventory_facts
                 WHERE fact_valid_to IS NULL
             """
-            result = self.safety_layer.conn.execute(query).fetchone()
+            # Single aggregate row - fetchnumpy avoids tuple construction
+            result = self.safety_layer.conn.execute(query).fetchnumpy()
+            avg_reliability = result["avg_reliability"][0]
             return {
-                "total_parts": result[0],
-                "total_units": result[1],
-                "avg_reliability": round(result[2], 3) if result[2] else 0,
-                "parts_with_warnings": result[3],
-                "urgent_reorders": result[4]
+                "total_parts": int(result["total_parts"][0]),
+                "total_units": int(result["total_units"][0]),
+                "avg_reliability": round(float(avg_reliability), 3) if avg_reliability else 0,
+                "parts_with_warnings": int(result["parts_with_warnings"][0]),
+                "urgent_reorders": int(result["urgent_reorders"][0])
             }
         except Exception as e:
             print(f"Error getting inventory summary: {e}")
@@ -14,8 +14,55 @@ This is what separates a "chatbot" from an "agentic system."
 """
 
 from typing import Dict, Any, Optional
+from collections import namedtuple
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import duckdb
+import json
+import os
+
+try:
+    # C extension, ~10x faster than fromisoformat for ISO strings
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    def _parse_iso(timestamp_str: str) -> datetime:
+        return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+
+
+# Hoisted so the statement text is built once, not per query. The
+# reliability check is evaluated as a vectorized SQL expression inside
+# DuckDB; the threshold is filled in from the class constants in __init__.
+# Freshness is deliberately NOT precomputed here: rows may be served from
+# the lru_cache long after they were fetched, so the age check has to run
+# against the clock at check time, not at fetch time.
+_GOLD_FACT_SQL_TEMPLATE = """
+    SELECT
+        part_id,
+        part_name,
+        qty_on_shelf,
+        in_transit_qty,
+        shadow_stock_qty,
+        effective_inventory,
+        data_reliability_index,
+        semantic_context,
+        has_inconsistency,
+        confidence_level,
+        reorder_recommendation,
+        shelf_last_updated,
+        data_reliability_index >= {min_reliability} AS is_reliable
+    FROM gold.inventory_facts
+    WHERE {part_filter}
+    AND fact_valid_to IS NULL  -- Get current fact only
+"""
+
+# Static row shape matching the SQL above - a namedtuple fill is one
+# C-level tuple copy versus a dozen dict inserts from zipping conn.description
+GoldFact = namedtuple('GoldFact', (
+    'part_id', 'part_name', 'qty_on_shelf', 'in_transit_qty',
+    'shadow_stock_qty', 'effective_inventory', 'data_reliability_index',
+    'semantic_context', 'has_inconsistency', 'confidence_level',
+    'reorder_recommendation', 'shelf_last_updated', 'is_reliable'
+))
 
 
 class AuraAgentSafetyLayer:
@@ -30,13 +77,42 @@ class AuraAgentSafetyLayer:
     MIN_RELIABILITY = 0.6
     MAX_DATA_AGE_HOURS = 24
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, conn: Optional[duckdb.DuckDBPyConnection] = None):
         """
         Args:
             db_path: Path to DuckDB database with Gold layer
+            conn: Optional pre-built connection to reuse. When several
+                interfaces share one connection they also share DuckDB's
+                object cache (parsed metadata, column statistics) and skip
+                repeated catalog warmup. close() only closes a connection
+                this instance created itself.
         """
         self.db_path = db_path
-        self.conn = duckdb.connect(db_path, read_only=True)
+        self._owns_conn = conn is None
+
+        if conn is None:
+            conn = duckdb.connect(
+                db_path,
+                read_only=True,
+                config={"threads": os.cpu_count()}
+            )
+            # Keep parsed file metadata cached between queries
+            conn.execute("PRAGMA enable_object_cache=true")
+
+        self.conn = conn
+        self._gold_sql = _GOLD_FACT_SQL_TEMPLATE.format(
+            min_reliability=self.MIN_RELIABILITY,
+            part_filter="part_id = ?"
+        )
+        # Batch variant: all requested parts in one vectorized scan
+        self._gold_sql_many = _GOLD_FACT_SQL_TEMPLATE.format(
+            min_reliability=self.MIN_RELIABILITY,
+            part_filter="list_contains(?, part_id)"
+        )
+        # Repeated part_ids during a demo session hit this cache instead of
+        # re-running the DuckDB query; facts only change when the pipeline
+        # rewrites the Gold layer (which reopens the connection anyway)
+        self._fetch_gold_row = lru_cache(maxsize=256)(self._fetch_gold_row_uncached)
     
     def query_with_safety(
         self, 
@@ -73,18 +149,39 @@ class AuraAgentSafetyLayer:
         """
         # Query gold layer
         fact = self._query_gold_layer(part_id)
-        
+
         if fact is None:
-            return {
-                "status": "BLOCKED",
-                "reason": f"No data found for part {part_id}",
-                "action": "Verify part_id is correct or add part to system",
-                "data": None
-            }
-        
+            return self._no_data_response(part_id)
+
+        # One clock read per query - reused by every freshness check below
+        now = datetime.now(timezone.utc)
+
+        return self._classify_fact(fact, question, now)
+
+    @staticmethod
+    def _no_data_response(part_id: str) -> Dict[str, Any]:
+        """Standard BLOCKED response when no current fact exists"""
+        return {
+            "status": "BLOCKED",
+            "reason": f"No data found for part {part_id}",
+            "action": "Verify part_id is correct or add part to system",
+            "data": None
+        }
+
+    def _classify_fact(
+        self,
+        fact: Dict[str, Any],
+        question: str,
+        now: datetime
+    ) -> Dict[str, Any]:
+        """
+        Run the safety checks on one fact and build the structured
+        SAFE/WARNING/BLOCKED response. Shared by query_with_safety and
+        query_many.
+        """
         # Run safety checks
         safety_checks = {
-            "is_fresh": self._check_freshness(fact),
+            "is_fresh": self._check_freshness(fact, now=now),
             "is_reliable": self._check_reliability(fact),
             "has_conflicts": fact.get("has_inconsistency", False),
             "confidence_level": fact.get("confidence_level", "unknown")
@@ -134,75 +231,101 @@ class AuraAgentSafetyLayer:
             "checks": safety_checks
         }
     
+    def query_many(self, part_ids) -> Dict[str, Dict[str, Any]]:
+        """
+        Evaluate safety for several parts in one DuckDB round-trip.
+
+        One vectorized scan replaces N per-part queries; results come back
+        through Arrow and every fact is classified against a single clock
+        read. Parts without a current fact get the standard BLOCKED response.
+
+        Returns:
+            {part_id: safety response} for every requested part
+        """
+        if not part_ids:
+            return {}
+
+        part_ids = list(part_ids)
+        tbl = self.conn.execute(self._gold_sql_many, [part_ids]).fetch_arrow_table()
+
+        now = datetime.now(timezone.utc)
+        results = {}
+        for fact in tbl.to_pylist():
+            reorder = fact.get('reorder_recommendation')
+            if type(reorder) is str:
+                fact['reorder_recommendation'] = json.loads(reorder)
+            results[fact['part_id']] = self._classify_fact(fact, "", now)
+
+        for part_id in part_ids:
+            if part_id not in results:
+                results[part_id] = self._no_data_response(part_id)
+
+        return results
+
+    def _fetch_gold_row_uncached(self, part_id: str) -> Optional[tuple]:
+        """
+        Run the gold-layer lookup. Wrapped in an lru_cache per instance
+        (see __init__); returns the raw row tuple so the cached value
+        stays immutable/hashable.
+        """
+        return self.conn.execute(self._gold_sql, [part_id]).fetchone()
+
     def _query_gold_layer(self, part_id: str) -> Optional[Dict[str, Any]]:
         """
         Query the gold.inventory_facts table.
         """
         try:
-            query = """
-                SELECT 
-                    part_id,
-                    part_name,
-                    qty_on_shelf,
-                    in_transit_qty,
-                    shadow_stock_qty,
-                    effective_inventory,
-                    data_reliability_index,
-                    semantic_context,
-                    has_inconsistency,
-                    confidence_level,
-                    reorder_recommendation,
-                    shelf_last_updated
-                FROM gold.inventory_facts
-                WHERE part_id = ?
-                AND fact_valid_to IS NULL  -- Get current fact only
-            """
-            
-            result = self.conn.execute(query, [part_id]).fetchone()
-            
+            result = self._fetch_gold_row(part_id)
+
             if result is None:
                 return None
-            
-            # Convert to dictionary
-            columns = [desc[0] for desc in self.conn.description]
-            fact = dict(zip(columns, result))
-            
-            # Parse JSON fields
-            if fact.get('reorder_recommendation'):
-                import json
-                reorder = fact['reorder_recommendation']
-                if isinstance(reorder, str):
-                    fact['reorder_recommendation'] = json.loads(reorder)
-            
+
+            # Convert to dictionary via the static row shape
+            fact = GoldFact(*result)._asdict()
+
+            # Parse JSON fields (outside the cache - mutates the dict)
+            reorder = fact.get('reorder_recommendation')
+            # DuckDB hands this back as either str or dict - exact type
+            # check is cheaper than isinstance on the hot path
+            if type(reorder) is str:
+                fact['reorder_recommendation'] = json.loads(reorder)
+
             return fact
-        
+
         except Exception as e:
             print(f"Error querying gold layer: {e}")
             return None
     
-    def _check_freshness(self, fact: Dict[str, Any]) -> bool:
+    def _check_freshness(self, fact: Dict[str, Any], now: Optional[datetime] = None) -> bool:
         """
         Check if data is fresh enough for autonomous decisions.
         Returns True if data is within MAX_DATA_AGE_HOURS threshold.
+
+        `now` can be passed in so batch callers evaluate many facts
+        against a single clock read.
         """
+        # Always computed here against the current clock - never at fetch
+        # time, where a cached row would freeze the verdict (see
+        # _GOLD_FACT_SQL_TEMPLATE)
         if not fact.get("shelf_last_updated"):
             return False
-        
+
         try:
             last_update_str = fact["shelf_last_updated"]
             # Handle both timezone-aware and naive timestamps
             if isinstance(last_update_str, str):
-                last_update = datetime.fromisoformat(last_update_str.replace('Z', '+00:00'))
+                last_update = _parse_iso(last_update_str)
             else:
                 last_update = last_update_str
-            
+
             # Make timezone-aware if naive
             if last_update.tzinfo is None:
                 last_update = last_update.replace(tzinfo=timezone.utc)
-            
-            now = datetime.now(timezone.utc)
+
+            if now is None:
+                now = datetime.now(timezone.utc)
             age = now - last_update
-            
+
             return age < timedelta(hours=self.MAX_DATA_AGE_HOURS)
         except Exception as e:
             print(f"Error checking freshness: {e}")
@@ -210,6 +333,9 @@ class AuraAgentSafetyLayer:
     
     def _check_reliability(self, fact: Dict[str, Any]) -> bool:
         """Check if reliability score meets minimum threshold"""
+        if "is_reliable" in fact:
+            return bool(fact["is_reliable"])
+
         reliability = fact.get("data_reliability_index", 0)
         return reliability >= self.MIN_RELIABILITY
     
@@ -231,5 +357,7 @@ class AuraAgentSafetyLayer:
         return reasoning
     
     def close(self):
-        """Close database connection"""
-        self.conn.close()
+        """Close the database connection (if this instance created it)"""
+        self._fetch_gold_row.cache_clear()
+        if self._owns_conn:
+            self.conn.close()
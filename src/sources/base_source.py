@@ -60,6 +60,16 @@ class BaseSource(ABC):
         """
         pass
     
+    def to_arrow(self):
+        """
+        Optionally return the full dataset as a pyarrow.Table.
+
+        Sources backed by tabular data can override this so the pipeline
+        hands the table straight to DuckDB, skipping the per-record dict
+        path entirely. Returning None keeps the record-based path.
+        """
+        return None
+
     @dlt.resource(name="raw_data", write_disposition="append")
     def to_dlt_resource(self) -> Iterator[Dict[str, Any]]:
         """
@@ -73,6 +83,10 @@ class BaseSource(ABC):
         
         This metadata is critical for downstream conflict resolution.
         """
+        # One clock read per extraction batch - every record in a batch
+        # shares the same ingestion timestamp, so there's no need to pay
+        # a syscall plus ISO string build per row
+        ingested_at = datetime.now(timezone.utc).isoformat()
         for record in self.load_raw_data():
             yield {
                 **record,  # Original data
@@ -81,7 +95,7 @@ class BaseSource(ABC):
                 "_source_type": self.source_type,
                 "_reliability_score": self.reliability_score,
                 "_update_frequency": self.update_frequency,
-                "_ingested_at": datetime.now(timezone.utc).isoformat(),
+                "_ingested_at": ingested_at,
             }
     
     def get_metadata(self) -> Dict[str, Any]:
@@ -9,11 +9,54 @@ Characteristics:
 - Requires flattening and USD→ZAR conversion
 """
 
+import orjson
+import pandas as pd
 import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Iterator, Dict, Any
 from datetime import datetime
+from urllib3.util.retry import Retry
 from .base_source import BaseSource
 
+# Shared across instances: a keep-alive connection pool plus bounded
+# retries with backoff, so repeat ingests reuse warm TCP connections
+# instead of paying a fresh handshake per call, and transient 5xx from
+# the logistics API don't fail the whole bronze run
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(500, 502, 503, 504),
+    ),
+)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+# FX rates move slowly, so cache the fetched rate for a few minutes.
+# Repeat bronze runs (and retries) within the window skip one HTTP
+# round-trip, and a brief FX-service outage doesn't block ingestion.
+_FX_TTL_SECONDS = 300
+_fx_cache: Dict[str, tuple] = {}
+
+
+def _fetch_fx_rate(endpoint: str) -> float:
+    """Fetch the FX rate, reusing a cached value if fresh enough"""
+    cached = _fx_cache.get(endpoint)
+    now = time.monotonic()
+    if cached is not None and now - cached[1] < _FX_TTL_SECONDS:
+        return cached[0]
+
+    fx_response = _session.get(endpoint, timeout=10)
+    fx_response.raise_for_status()
+    rate = orjson.loads(fx_response.content)["rate"]
+    _fx_cache[endpoint] = (rate, now)
+    return rate
+
 
 class LogisticsSource(BaseSource):
     """
@@ -63,53 +106,53 @@ class LogisticsSource(BaseSource):
         5. Yield one record per part (not per shipment)
         """
         try:
-            # Fetch shipment data
-            response = requests.get(self.api_endpoint, timeout=10)
+            # Fetch shipments and the FX rate concurrently - the two
+            # endpoints are independent, so the slower one sets wall time
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                shipments_future = pool.submit(
+                    _session.get, self.api_endpoint, timeout=10
+                )
+                fx_future = pool.submit(
+                    _fetch_fx_rate, self.fx_rate_endpoint
+                )
+                response = shipments_future.result()
+                fx_rate = fx_future.result()
+
             response.raise_for_status()
-            data = response.json()
-            
-            # Fetch FX rate
-            fx_response = requests.get(self.fx_rate_endpoint, timeout=10)
-            fx_response.raise_for_status()
-            fx_rate = fx_response.json()["rate"]
-            
-            # TODO: Flatten and yield records
-            # Hint: Loop through shipments, then loop through parts within each shipment
-            # Each part becomes a separate record
+            # orjson parses the raw bytes ~2x faster than response.json()
+            data = orjson.loads(response.content)
             
-            for shipment in data.get("shipments", []):
-                shipment_id = shipment["shipment_id"]
-                supplier = shipment["supplier"]
-                status = shipment["status"]
-                estimated_arrival = shipment["estimated_arrival"]
-                last_updated = shipment["last_updated"]
-                
-                # Flatten parts
-                for part in shipment.get("parts", []):
-                    # Convert USD to ZAR
-                    unit_cost_usd = part["unit_cost_usd"]
-                    unit_cost_zar = unit_cost_usd * fx_rate
-                    
-                    yield {
-                        "shipment_id": shipment_id,
-                        "part_id": part["part_id"],
-                        "quantity": part["quantity_shipped"],
-                        "unit_cost_zar": round(unit_cost_zar, 2),
-                        "unit_cost_usd": unit_cost_usd,
-                        "fx_rate_used": fx_rate,
-                        "supplier": supplier,
-                        "status": status,
-                        "estimated_arrival": estimated_arrival,
-                        "last_updated": last_updated,
-                        # Add semantic context
-                        "quantity_semantic": "in_transit",  # Critical for conflict resolution
-                    }
+            shipments = data.get("shipments", [])
+            if not shipments:
+                return
+
+            # Flatten the nested parts arrays in one json_normalize call
+            # and convert USD→ZAR as a single vectorized multiply over the
+            # cost column instead of a Python float op per part
+            df = pd.json_normalize(
+                shipments,
+                record_path="parts",
+                meta=[
+                    "shipment_id", "supplier", "status",
+                    "estimated_arrival", "last_updated"
+                ],
+            )
+            df = df.rename(columns={"quantity_shipped": "quantity"})
+            df["unit_cost_zar"] = (df["unit_cost_usd"] * fx_rate).round(2)
+            df["fx_rate_used"] = fx_rate
+            # Semantic context - critical for conflict resolution
+            df["quantity_semantic"] = "in_transit"
+
+            yield from df[[
+                "shipment_id", "part_id", "quantity", "unit_cost_zar",
+                "unit_cost_usd", "fx_rate_used", "supplier", "status",
+                "estimated_arrival", "last_updated", "quantity_semantic"
+            ]].to_dict(orient="records")
         
         except requests.RequestException as e:
-            # TODO: Implement proper error handling
-            # In production, you'd want to:
+            # Retries with exponential backoff are handled by the session
+            # adapter above. In production, you'd additionally want to:
             # - Log the error
-            # - Maybe retry with exponential backoff
             # - Store failed fetches for manual review
             print(f"Error fetching logistics data: {e}")
             raise
@@ -1,24 +1,43 @@
 """
-Warehouse CSV Source
+Warehouse File Source
 
 Characteristics:
 - Manual data entry (prone to delays, typos)
 - Updated at shift changes (every 8 hours)
 - Lower reliability score (0.7)
 - Represents physical "on-shelf" inventory
+
+Canonical storage is Parquet (typed columns, no reparsing); CSV is still
+accepted for hand-edited files.
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
+from pyarrow import csv as pacsv
 from typing import Iterator, Dict, Any
 from .base_source import BaseSource
 
+# Rows streamed per batch - caps peak memory at ~2x batch size instead of
+# holding the whole warehouse table in RAM at once
+BATCH_SIZE = 10_000
+
+# Declared column types skip the CSV dtype-inference pass; everything
+# else parses as string, matching the Parquet schema
+_CSV_CONVERT_OPTIONS = pacsv.ConvertOptions(
+    column_types={
+        "qty_on_shelf": pa.int32(),
+        "unit_cost_zar": pa.float64(),
+    }
+)
+
 
 class WarehouseSource(BaseSource):
     """
-    Ingests warehouse physical inventory from CSV file.
-    
-    Expected CSV columns:
+    Ingests warehouse physical inventory from a Parquet (or CSV) file.
+
+    Expected columns:
     - part_id: Unique part identifier
     - part_name: Human-readable name
     - qty_on_shelf: Physical count
@@ -26,45 +45,100 @@ class WarehouseSource(BaseSource):
     - last_updated: When count was performed
     - warehouse_location: Which warehouse
     """
-    
-    def __init__(self, csv_path: str, reliability_score: float = 0.7):
+
+    def __init__(self, data_path: str, reliability_score: float = 0.7):
+        self.data_path = Path(data_path)
+
+        # Only the CSV is tracked in git; the Parquet is produced by data
+        # generation. On a fresh clone fall back to the CSV next to the
+        # configured path instead of failing before any extraction runs.
+        if not self.data_path.exists() and self.data_path.suffix == ".parquet":
+            csv_path = self.data_path.with_suffix(".csv")
+            if csv_path.exists():
+                print(f"   ⚠️  {self.data_path} not found, using {csv_path}")
+                self.data_path = csv_path
+
         super().__init__(
             name="warehouse_stock",
             reliability_score=reliability_score,
-            source_type="csv",
+            source_type="parquet" if self.data_path.suffix == ".parquet" else "csv",
             update_frequency="shift_change"
         )
-        self.csv_path = Path(csv_path)
-        
-        if not self.csv_path.exists():
-            raise FileNotFoundError(f"Warehouse CSV not found: {csv_path}")
-    
+
+        if not self.data_path.exists():
+            raise FileNotFoundError(f"Warehouse data file not found: {data_path}")
+
     def load_raw_data(self) -> Iterator[Dict[str, Any]]:
         """
-        Load warehouse data from CSV.
-        
+        Load warehouse data from Parquet (preferred) or CSV.
+
         TODO: Add data quality checks here:
         - Check for negative quantities
         - Validate part_id format
         - Handle missing values
         """
-        # Read CSV
-        df = pd.read_csv(self.csv_path)
-        
         # TODO: Add data cleaning logic
         # Example:
         # - df['part_id'] = df['part_id'].str.strip().str.upper()
         # - df = df[df['qty_on_shelf'] >= 0]  # Remove negative quantities
-        
-        # Convert to dictionaries and yield
-        for _, row in df.iterrows():
-            yield {
-                "part_id": row["part_id"],
-                "part_name": row["part_name"],
-                "quantity": row["qty_on_shelf"],  # Semantic: on-shelf quantity
-                "unit_cost_zar": float(row["unit_cost_zar"]),
-                "last_updated": row["last_updated"],
-                "warehouse_location": row["warehouse_location"],
-                # Add semantic context
-                "quantity_semantic": "on_shelf",  # Important for conflict resolution
-            }
\ No newline at end of file
+
+        if self.data_path.suffix == ".parquet":
+            # Arrow-native streaming: typed batches, no full-table pandas
+            # materialization; last_updated comes back as a timestamp
+            parquet_file = pq.ParquetFile(self.data_path)
+            for batch in parquet_file.iter_batches(batch_size=BATCH_SIZE):
+                yield from self._to_records(batch.to_pandas())
+        else:
+            # Arrow's CSV reader parses blocks into typed columns off the
+            # main thread and streams them, keeping memory bounded like
+            # the Parquet path
+            with pacsv.open_csv(
+                self.data_path, convert_options=_CSV_CONVERT_OPTIONS
+            ) as reader:
+                for batch in reader:
+                    yield from self._to_records(batch.to_pandas())
+
+    def to_arrow(self) -> pa.Table:
+        """
+        Whole dataset as a typed Arrow table, already in the standard
+        warehouse record shape. Lets the pipeline register the table with
+        DuckDB directly instead of yielding one dict per row.
+        """
+        if self.data_path.suffix == ".parquet":
+            table = pq.read_table(self.data_path)
+        else:
+            table = pacsv.read_csv(
+                self.data_path, convert_options=_CSV_CONVERT_OPTIONS
+            )
+
+        table = table.rename_columns([
+            "quantity" if name == "qty_on_shelf" else name
+            for name in table.column_names
+        ])
+        # Semantic context as a constant column
+        table = table.append_column(
+            "quantity_semantic",
+            pa.array(["on_shelf"] * table.num_rows)
+        )
+        return table.select([
+            "part_id", "part_name", "quantity", "unit_cost_zar",
+            "last_updated", "warehouse_location", "quantity_semantic"
+        ])
+
+    @staticmethod
+    def _to_records(df: pd.DataFrame) -> list:
+        """
+        Map a raw batch onto the standard warehouse record shape.
+
+        Column operations run vectorized (one cast per column, not per
+        cell) and rows come out via to_dict('records') rather than
+        iterrows, which would box every row into a Series.
+        """
+        df = df.rename(columns={"qty_on_shelf": "quantity"})
+        df["unit_cost_zar"] = df["unit_cost_zar"].astype(float)
+        # Semantic context - important for conflict resolution
+        df["quantity_semantic"] = "on_shelf"
+        return df[[
+            "part_id", "part_name", "quantity", "unit_cost_zar",
+            "last_updated", "warehouse_location", "quantity_semantic"
+        ]].to_dict(orient="records")
\ No newline at end of file
@@ -1,9 +1,10 @@
-from .semantic_resolver import SemanticConflictResolver
+from .semantic_resolver import SemanticConflictResolver, ResolvedInventory
 from .bronze_to_silver import normalize_to_events
 from .silver_to_gold import aggregate_events_to_facts
 
 __all__ = [
     "SemanticConflictResolver",
+    "ResolvedInventory",
     "normalize_to_events",
     "aggregate_events_to_facts"
-]
\ No newline at end of file
+]
@@ -9,11 +9,73 @@ This is where Events become Facts:
 """
 
 import dlt
+import duckdb
+import pandas as pd
 from typing import List, Dict, Any
-from collections import defaultdict
 from datetime import datetime
 from .semantic_resolver import SemanticConflictResolver
 
+_resolver = SemanticConflictResolver()
+
+# Whole-batch aggregation pushed into DuckDB: FILTER aggregates compute
+# the per-part rollups (latest shelf count, in-transit sum, delivered
+# sum, shadow-stock flag, weighted reliability) in one vectorized scan
+# over the registered events frame, so Python only builds fact dicts
+# from one aggregated row per part
+_AGG_SQL = """
+    WITH agg AS (
+        SELECT
+            part_id,
+            any_value(part_name) FILTER (
+                WHERE source_system = 'warehouse_stock'
+                AND part_name IS NOT NULL
+            ) AS part_name,
+            COALESCE(arg_max(quantity, event_timestamp) FILTER (
+                WHERE source_system = 'warehouse_stock'
+            ), 0) AS qty_on_shelf,
+            COALESCE(arg_max(reliability_score, event_timestamp) FILTER (
+                WHERE source_system = 'warehouse_stock'
+            ), 0.0) AS warehouse_reliability,
+            max(event_timestamp) FILTER (
+                WHERE source_system = 'warehouse_stock'
+            ) AS shelf_last_updated,
+            COALESCE(sum(quantity) FILTER (
+                WHERE source_system = 'logistics_shipments'
+                AND status = 'in_transit'
+            ), 0) AS in_transit_qty,
+            COALESCE(sum(quantity) FILTER (
+                WHERE source_system = 'logistics_shipments'
+                AND status = 'delivered'
+            ), 0) AS delivered_qty,
+            max(event_timestamp) FILTER (
+                WHERE source_system = 'logistics_shipments'
+                AND (status = 'delivered' OR event_type = 'goods_receipt')
+            ) AS last_delivery_at
+        FROM events_df
+        WHERE part_id IS NOT NULL
+        GROUP BY part_id
+    )
+    SELECT
+        part_id,
+        part_name,
+        qty_on_shelf,
+        in_transit_qty,
+        delivered_qty,
+        qty_on_shelf + in_transit_qty AS effective_inventory,
+        COALESCE(shelf_last_updated < last_delivery_at, FALSE)
+            AS has_inconsistency,
+        CASE
+            WHEN qty_on_shelf + in_transit_qty > 0 THEN round(
+                (qty_on_shelf * warehouse_reliability + in_transit_qty * 0.9)
+                / (qty_on_shelf + in_transit_qty), 3)
+            WHEN warehouse_reliability > 0 THEN warehouse_reliability
+            ELSE 0.5
+        END AS data_reliability_index,
+        shelf_last_updated
+    FROM agg
+    ORDER BY part_id
+"""
+
 
 @dlt.transformer(name="gold_inventory_facts", write_disposition="merge", primary_key="part_id")
 def aggregate_events_to_facts(
@@ -21,81 +83,169 @@ def aggregate_events_to_facts(
 ) -> List[Dict[str, Any]]:
     """
     Aggregates event stream into current facts.
-    
-    TODO: Implement event-to-fact aggregation
-    
+
     Process:
-    1. Group events by part_id
-    2. Separate warehouse events from logistics events
-    3. Use SemanticConflictResolver to create unified view
-    4. Calculate reorder recommendations
-    5. Add temporal validity (fact_valid_from, fact_valid_to)
-    
+    1. Push per-part aggregation into DuckDB (FILTER aggregates over a
+       registered DataFrame of the events)
+    2. Build one fact dict per aggregated row - reorder recommendation,
+       confidence level, semantic context
+    3. Add temporal validity (fact_valid_from, fact_valid_to)
+
+    Falls back to SemanticConflictResolver.resolve_inventory_batch - the
+    same rules as columnar pandas groupbys - when the in-database path is
+    unavailable.
+
     Returns:
         List of fact records (one per part)
     """
-    resolver = SemanticConflictResolver()
-    
-    # Group events by part_id
-    events_by_part = defaultdict(lambda: {"warehouse": [], "logistics": []})
-    
-    for event in silver_events:
-        part_id = event["part_id"]
-        source = event["source_system"]
-        
-        if source == "warehouse_stock":
-            events_by_part[part_id]["warehouse"].append(event)
-        elif source == "logistics_shipments":
-            events_by_part[part_id]["logistics"].append(event)
-    
+    if not silver_events:
+        return []
+
+    try:
+        return _aggregate_in_database(silver_events)
+    except Exception as e:
+        print(f"Warning: in-database aggregation failed ({e}); using columnar resolver")
+        return _aggregate_with_batch_resolver(silver_events)
+
+
+def _aggregate_in_database(
+    silver_events: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """One SQL scan per batch; Python only assembles the fact records"""
+    events_df = pd.DataFrame(silver_events)
+    for col in ("part_name", "status", "event_type", "reliability_score"):
+        if col not in events_df.columns:
+            events_df[col] = None
+
+    # Intern the low-cardinality label columns before registering: the
+    # status/source equality filters in the SQL then run over dictionary
+    # codes rather than full strings
+    for col in ("source_system", "source_type", "status", "event_type"):
+        if col in events_df.columns:
+            events_df[col] = events_df[col].astype("category")
+
+    conn = duckdb.connect()
+    try:
+        conn.register("events_df", events_df)
+        agg_rows = conn.execute(_AGG_SQL).fetch_arrow_table().to_pylist()
+    finally:
+        conn.close()
+
+    fact_valid_from = datetime.now().isoformat()
+
+    facts = []
+    for row in agg_rows:
+        has_inconsistency = bool(row["has_inconsistency"])
+        shadow_qty = row["delivered_qty"] if has_inconsistency else 0
+        effective_inventory = row["effective_inventory"]
+        reliability = row["data_reliability_index"]
+
+        shelf_last_updated = row["shelf_last_updated"]
+        if isinstance(shelf_last_updated, datetime):
+            shelf_last_updated = shelf_last_updated.isoformat()
+
+        facts.append({
+            "part_id": row["part_id"],
+            "part_name": row["part_name"] or "Unknown",
+
+            # Inventory
+            "qty_on_shelf": row["qty_on_shelf"],
+            "in_transit_qty": row["in_transit_qty"],
+            "effective_inventory": effective_inventory,
+
+            # Metadata for Aura
+            "data_reliability_index": reliability,
+            "semantic_context": _resolver._generate_context(
+                row["qty_on_shelf"],
+                row["in_transit_qty"],
+                shadow_qty,
+                has_inconsistency
+            ),
+            "has_inconsistency": has_inconsistency,
+            "confidence_level": _assess_confidence(
+                reliability, has_inconsistency
+            ),
+
+            # Reorder logic
+            "reorder_recommendation": _calculate_reorder_recommendation(
+                effective_inventory,
+                has_inconsistency
+            ),
+
+            # Temporal
+            "fact_valid_from": fact_valid_from,
+            "fact_valid_to": None,  # Currently valid
+            "shelf_last_updated": shelf_last_updated,
+        })
+
+    return facts
+
+
+def _aggregate_with_batch_resolver(
+    silver_events: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Fallback: resolve every part in one columnar pass.
+
+    resolve_inventory_batch applies the same rules as the per-part API
+    as pandas groupby aggregations - no Python call or timestamp reparse
+    per part - so this path stays fast even when DuckDB is unavailable.
+    """
+    events_df = pd.DataFrame(silver_events)
+    for col in ("part_name", "status", "reliability_score"):
+        if col not in events_df.columns:
+            events_df[col] = None
+
+    resolved = _resolver.resolve_inventory_batch(events_df)
+
+    # Part names from warehouse records, one groupby pass
+    wh = events_df.loc[events_df["source_system"] == "warehouse_stock"]
+    part_names = (
+        wh.dropna(subset=["part_name"])
+        .groupby("part_id")["part_name"].first()
+    )
+
+    fact_valid_from = datetime.now().isoformat()
+
     # Create facts for each part
     facts = []
-    for part_id, events in events_by_part.items():
-        # Resolve semantic conflicts
-        unified = resolver.resolve_inventory(
-            events["warehouse"],
-            events["logistics"]
-        )
-        
-        # Get part name (from any record)
-        part_name = "Unknown"
-        if events["warehouse"]:
-            # TODO: Extract part_name from warehouse records
-            pass
-        
+    for row in resolved.to_dict(orient="records"):
         # Calculate reorder recommendation
         reorder_rec = _calculate_reorder_recommendation(
-            unified["effective_inventory"],
-            unified["has_inconsistency"]
+            row["effective_inventory"],
+            row["has_inconsistency"]
         )
-        
+
         # Create fact record
         fact = {
-            "part_id": part_id,
-            "part_name": part_name,
-            
+            "part_id": row["part_id"],
+            "part_name": part_names.get(row["part_id"], "Unknown"),
+
             # Inventory
-            "qty_on_shelf": unified["qty_on_shelf"],
-            "in_transit_qty": unified["in_transit_qty"],
-            "effective_inventory": unified["effective_inventory"],
-            
+            "qty_on_shelf": row["qty_on_shelf"],
+            "in_transit_qty": row["in_transit_qty"],
+            "effective_inventory": row["effective_inventory"],
+
             # Metadata for Aura
-            "data_reliability_index": unified["data_reliability_index"],
-            "semantic_context": unified["semantic_context"],
-            "has_inconsistency": unified["has_inconsistency"],
-            "confidence_level": _assess_confidence(unified),
-            
+            "data_reliability_index": row["data_reliability_index"],
+            "semantic_context": row["semantic_context"],
+            "has_inconsistency": row["has_inconsistency"],
+            "confidence_level": _assess_confidence(
+                row["data_reliability_index"],
+                row["has_inconsistency"]
+            ),
+
             # Reorder logic
             "reorder_recommendation": reorder_rec,
-            
+
             # Temporal
-            "fact_valid_from": datetime.now().isoformat(),
+            "fact_valid_from": fact_valid_from,
             "fact_valid_to": None,  # Currently valid
-            "shelf_last_updated": unified["shelf_last_updated"],
+            "shelf_last_updated": row["shelf_last_updated"],
         }
-        
+
         facts.append(fact)
-    
+
     return facts
 
 
@@ -105,9 +255,9 @@ def _calculate_reorder_recommendation(
 ) -> Dict[str, Any]:
     """
     Simple rule-based reorder logic.
-    
+
     TODO: Implement reorder rules
-    
+
     Rules (simplified for demo):
     - If inventory < 30: URGENT reorder
     - If inventory < 50: RECOMMEND reorder
@@ -120,7 +270,7 @@ def _calculate_reorder_recommendation(
             "urgency": "manual_review",
             "reasoning": "Data inconsistency detected - requires human verification"
         }
-    
+
     if effective_inventory < 30:
         return {
             "should_reorder": True,
@@ -141,21 +291,18 @@ def _calculate_reorder_recommendation(
         }
 
 
-def _assess_confidence(unified_inventory: Dict[str, Any]) -> str:
+def _assess_confidence(reliability: float, has_issue: bool) -> str:
     """
     Assigns confidence level based on reliability and consistency.
-    
+
     Levels:
     - high: reliability > 0.85, no inconsistencies
     - medium: reliability 0.6-0.85, no inconsistencies
     - low: reliability < 0.6 OR inconsistencies detected
     """
-    reliability = unified_inventory["data_reliability_index"]
-    has_issue = unified_inventory["has_inconsistency"]
-    
     if has_issue or reliability < 0.6:
         return "low"
     elif reliability >= 0.85:
         return "high"
     else:
-        return "medium"
\ No newline at end of file
+        return "medium"